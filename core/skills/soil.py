@@ -5,6 +5,7 @@ Deterministic rule-based soil diagnosis.
 All thresholds and calculations are documented and verifiable.
 """
 
+from bisect import bisect_right
 from typing import Optional
 
 from core.skills.types import (
@@ -82,27 +83,63 @@ PH_STATUS_TH = {
     PHStatus.VERY_ALKALINE: "เป็นด่างจัด",
 }
 
+# Health score contribution per nutrient level
+LEVEL_SCORES = {
+    NutrientLevel.VERY_LOW: 20,
+    NutrientLevel.LOW: 40,
+    NutrientLevel.MEDIUM: 70,
+    NutrientLevel.HIGH: 90,
+    NutrientLevel.VERY_HIGH: 80,  # Too high is also not ideal
+}
 
-def _classify_ph(ph: float) -> tuple[PHStatus, str, float]:
-    """Classify pH and return status, Thai description, and score."""
-    for status_name, (low, high) in PH_THRESHOLDS.items():
-        if low <= ph < high:
-            status = PHStatus(status_name)
-            status_th = PH_STATUS_TH[status]
 
-            # Score: optimal is 100, decreases as pH deviates
-            if status == PHStatus.OPTIMAL:
-                score = 100.0
-            elif status in (PHStatus.SLIGHTLY_ACIDIC, PHStatus.SLIGHTLY_ALKALINE):
-                score = 80.0
-            elif status in (PHStatus.ACIDIC, PHStatus.ALKALINE):
-                score = 50.0
-            else:
-                score = 30.0
+# =============================================================================
+# CLASSIFICATION KERNELS
+# Threshold tables above flattened into sorted cutoffs, so each lookup is a
+# single bisect over floats. Enum/Thai mapping stays in the wrappers below.
+# =============================================================================
 
-            return status, status_th, score
+_PH_STATUSES = tuple(PHStatus(name) for name in PH_THRESHOLDS)
+_PH_CUTOFFS = tuple(high for _, high in PH_THRESHOLDS.values())[:-1]
+_PH_MIN = min(low for low, _ in PH_THRESHOLDS.values())
+_PH_MAX = max(high for _, high in PH_THRESHOLDS.values())
+
+# Score per pH band: optimal is 100, decreases as pH deviates
+_PH_SCORES = (30.0, 50.0, 80.0, 100.0, 80.0, 50.0, 30.0)
+
+_NUTRIENT_LEVELS = tuple(
+    NutrientLevel(name) for name in NUTRIENT_THRESHOLDS["nitrogen"] if name != "optimal"
+)
+_NUTRIENT_CUTOFFS = {
+    nutrient: tuple(
+        high for name, (_, high) in thresholds.items() if name != "optimal"
+    )[:-1]
+    for nutrient, thresholds in NUTRIENT_THRESHOLDS.items()
+}
+
+
+def _ph_band(ph: float) -> int:
+    """Return the index of the pH band containing ph, or -1 if out of range."""
+    if not _PH_MIN <= ph < _PH_MAX:
+        return -1
+    return bisect_right(_PH_CUTOFFS, ph)
+
+
+def _nutrient_band(value: float, cutoffs: tuple[float, ...]) -> int:
+    """Return the index of the nutrient level band containing value, or -1."""
+    if not 0 <= value < float("inf"):
+        return -1
+    return bisect_right(cutoffs, value)
+
+
+def _classify_ph(ph: float) -> tuple[PHStatus, str, float]:
+    """Classify pH and return status, Thai description, and score."""
+    band = _ph_band(ph)
+    if band < 0:
+        return PHStatus.OPTIMAL, PH_STATUS_TH[PHStatus.OPTIMAL], 100.0
 
-    return PHStatus.OPTIMAL, PH_STATUS_TH[PHStatus.OPTIMAL], 100.0
+    status = _PH_STATUSES[band]
+    return status, PH_STATUS_TH[status], _PH_SCORES[band]
 
 
 def _classify_nutrient(
@@ -114,12 +151,11 @@ def _classify_nutrient(
 
     # Find level
     level = NutrientLevel.MEDIUM
-    for level_name, (low, high) in thresholds.items():
-        if level_name == "optimal":
-            continue
-        if low <= value < high:
-            level = NutrientLevel(level_name)
-            break
+    cutoffs = _NUTRIENT_CUTOFFS.get(nutrient)
+    if cutoffs is not None:
+        band = _nutrient_band(value, cutoffs)
+        if band >= 0:
+            level = _NUTRIENT_LEVELS[band]
 
     level_th = LEVEL_TH[level]
 
@@ -318,16 +354,9 @@ def soil_diagnosis(input_data: SoilInput) -> DiagnosisResult:
     if result.ph_score is not None:
         scores.append(result.ph_score)
 
-    for analysis in [result.nitrogen_analysis, result.phosphorus_analysis, result.potassium_analysis]:
+    for analysis in (result.nitrogen_analysis, result.phosphorus_analysis, result.potassium_analysis):
         if analysis:
-            level_scores = {
-                NutrientLevel.VERY_LOW: 20,
-                NutrientLevel.LOW: 40,
-                NutrientLevel.MEDIUM: 70,
-                NutrientLevel.HIGH: 90,
-                NutrientLevel.VERY_HIGH: 80,  # Too high is also not ideal
-            }
-            scores.append(level_scores.get(analysis.level, 70))
+            scores.append(LEVEL_SCORES.get(analysis.level, 70))
 
     result.health_score = sum(scores) / len(scores) if scores else None
 
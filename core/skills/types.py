@@ -7,7 +7,7 @@ All outputs are deterministic and verifiable.
 
 from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class NutrientLevel(str, Enum):
@@ -57,6 +57,8 @@ class Recommendation(BaseModel):
 
 class SoilInput(BaseModel):
     """Input for soil diagnosis skill."""
+    model_config = ConfigDict(frozen=True)
+
     ph: Optional[float] = Field(None, ge=0, le=14, description="Soil pH value")
     nitrogen: Optional[float] = Field(None, ge=0, description="Nitrogen content (mg/kg)")
     phosphorus: Optional[float] = Field(None, ge=0, description="Available phosphorus (mg/kg)")
@@ -121,6 +123,8 @@ class FertilizerOption(BaseModel):
 
 class FertilizerInput(BaseModel):
     """Input for fertilizer planning skill."""
+    model_config = ConfigDict(frozen=True)
+
     crop: str = Field(..., description="Target crop name")
     growth_stage: Optional[str] = Field(None, description="Current growth stage")
     field_size_rai: float = Field(1.0, gt=0, description="Field size in rai")
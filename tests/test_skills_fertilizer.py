@@ -9,12 +9,28 @@ from core.skills.types import FertilizerInput
 from core.skills.fertilizer import fertilizer_plan
 
 
+# Fully specified rice input shared by tests (inputs are frozen models)
+OPTIMAL_FULL_FERT = FertilizerInput(
+    crop="rice",
+    target_yield_kg_per_rai=500,
+    soil_n=30,
+    soil_p=20,
+    soil_k=80,
+)
+
+
+@pytest.fixture(scope="module")
+def rice_baseline():
+    """Default rice plan (1 rai, no soil data), computed once per module."""
+    return fertilizer_plan(FertilizerInput(crop="rice"))
+
+
 class TestCropRequirements:
     """Test crop-specific nutrient requirements."""
 
-    def test_rice_requirements(self):
+    def test_rice_requirements(self, rice_baseline):
         """Rice should have standard N-P-K requirements."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         assert result.target_n_kg_per_rai > 0
         assert result.target_p2o5_kg_per_rai > 0
         assert result.target_k2o_kg_per_rai > 0
@@ -35,11 +51,11 @@ class TestCropRequirements:
         # Should have assumptions about using default
         assert len(result.assumptions) > 0 or len(result.warnings) > 0
 
-    def test_case_insensitive_crop(self):
+    def test_case_insensitive_crop(self, rice_baseline):
         """Crop name should be case-insensitive."""
         result1 = fertilizer_plan(FertilizerInput(crop="Rice"))
         result2 = fertilizer_plan(FertilizerInput(crop="RICE"))
-        result3 = fertilizer_plan(FertilizerInput(crop="rice"))
+        result3 = rice_baseline
         assert result1.target_n_kg_per_rai == result2.target_n_kg_per_rai
         assert result2.target_n_kg_per_rai == result3.target_n_kg_per_rai
 
@@ -47,23 +63,21 @@ class TestCropRequirements:
 class TestYieldAdjustment:
     """Test target yield adjustments."""
 
-    def test_higher_yield_increases_requirements(self):
+    def test_higher_yield_increases_requirements(self, rice_baseline):
         """Higher target yield should increase nutrient requirements."""
-        base_result = fertilizer_plan(FertilizerInput(crop="rice"))
         high_yield_result = fertilizer_plan(FertilizerInput(
             crop="rice",
             target_yield_kg_per_rai=800,  # Higher than base 500
         ))
-        assert high_yield_result.target_n_kg_per_rai > base_result.target_n_kg_per_rai
+        assert high_yield_result.target_n_kg_per_rai > rice_baseline.target_n_kg_per_rai
 
-    def test_lower_yield_decreases_requirements(self):
+    def test_lower_yield_decreases_requirements(self, rice_baseline):
         """Lower target yield should decrease nutrient requirements."""
-        base_result = fertilizer_plan(FertilizerInput(crop="rice"))
         low_yield_result = fertilizer_plan(FertilizerInput(
             crop="rice",
             target_yield_kg_per_rai=300,  # Lower than base 500
         ))
-        assert low_yield_result.target_n_kg_per_rai < base_result.target_n_kg_per_rai
+        assert low_yield_result.target_n_kg_per_rai < rice_baseline.target_n_kg_per_rai
 
     def test_yield_factor_capped(self):
         """Yield adjustment factor should be capped."""
@@ -79,41 +93,37 @@ class TestYieldAdjustment:
 class TestSoilAdjustment:
     """Test soil nutrient adjustments."""
 
-    def test_high_soil_n_reduces_requirement(self):
+    def test_high_soil_n_reduces_requirement(self, rice_baseline):
         """High soil N should reduce N fertilizer recommendation."""
-        base_result = fertilizer_plan(FertilizerInput(crop="rice"))
         high_n_result = fertilizer_plan(FertilizerInput(
             crop="rice",
             soil_n=50,  # High soil N
         ))
-        assert high_n_result.target_n_kg_per_rai < base_result.target_n_kg_per_rai
+        assert high_n_result.target_n_kg_per_rai < rice_baseline.target_n_kg_per_rai
 
-    def test_high_soil_p_reduces_requirement(self):
+    def test_high_soil_p_reduces_requirement(self, rice_baseline):
         """High soil P should reduce P fertilizer recommendation."""
-        base_result = fertilizer_plan(FertilizerInput(crop="rice"))
         high_p_result = fertilizer_plan(FertilizerInput(
             crop="rice",
             soil_p=40,  # High soil P
         ))
-        assert high_p_result.target_p2o5_kg_per_rai < base_result.target_p2o5_kg_per_rai
+        assert high_p_result.target_p2o5_kg_per_rai < rice_baseline.target_p2o5_kg_per_rai
 
-    def test_high_soil_k_reduces_requirement(self):
+    def test_high_soil_k_reduces_requirement(self, rice_baseline):
         """High soil K should reduce K fertilizer recommendation."""
-        base_result = fertilizer_plan(FertilizerInput(crop="rice"))
         high_k_result = fertilizer_plan(FertilizerInput(
             crop="rice",
             soil_k=150,  # High soil K
         ))
-        assert high_k_result.target_k2o_kg_per_rai < base_result.target_k2o_kg_per_rai
+        assert high_k_result.target_k2o_kg_per_rai < rice_baseline.target_k2o_kg_per_rai
 
 
 class TestFertilizerOptions:
     """Test fertilizer option generation."""
 
-    def test_options_generated(self):
+    def test_options_generated(self, rice_baseline):
         """Fertilizer options should be generated."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
-        assert len(result.fertilizer_options) > 0
+        assert len(rice_baseline.fertilizer_options) > 0
 
     def test_options_sorted_by_cost(self):
         """Options should be sorted by cost (lowest first)."""
@@ -122,9 +132,9 @@ class TestFertilizerOptions:
             costs = [opt.total_cost for opt in result.fertilizer_options]
             assert costs == sorted(costs)
 
-    def test_recommended_option_index_valid(self):
+    def test_recommended_option_index_valid(self, rice_baseline):
         """Recommended option index should be valid."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         if result.fertilizer_options:
             assert 0 <= result.recommended_option_index < len(result.fertilizer_options)
 
@@ -171,9 +181,9 @@ class TestBudgetConstraint:
 class TestFieldSize:
     """Test field size calculations."""
 
-    def test_larger_field_higher_total_cost(self):
+    def test_larger_field_higher_total_cost(self, rice_baseline):
         """Larger field should have higher total cost."""
-        small_field = fertilizer_plan(FertilizerInput(crop="rice", field_size_rai=1))
+        small_field = rice_baseline  # field_size_rai defaults to 1
         large_field = fertilizer_plan(FertilizerInput(crop="rice", field_size_rai=10))
 
         if small_field.fertilizer_options and large_field.fertilizer_options:
@@ -182,9 +192,9 @@ class TestFieldSize:
             large_cost = large_field.total_cost_thb
             assert large_cost > small_cost
 
-    def test_cost_per_rai_consistent(self):
+    def test_cost_per_rai_consistent(self, rice_baseline):
         """Cost per rai should be similar regardless of field size."""
-        small_field = fertilizer_plan(FertilizerInput(crop="rice", field_size_rai=1))
+        small_field = rice_baseline  # field_size_rai defaults to 1
         large_field = fertilizer_plan(FertilizerInput(crop="rice", field_size_rai=10))
 
         if small_field.fertilizer_options and large_field.fertilizer_options:
@@ -198,18 +208,12 @@ class TestConfidenceCalculation:
 
     def test_full_inputs_high_confidence(self):
         """All inputs should give high confidence."""
-        result = fertilizer_plan(FertilizerInput(
-            crop="rice",
-            target_yield_kg_per_rai=500,
-            soil_n=30,
-            soil_p=20,
-            soil_k=80,
-        ))
+        result = fertilizer_plan(OPTIMAL_FULL_FERT)
         assert result.confidence == 1.0
 
-    def test_missing_inputs_lower_confidence(self):
+    def test_missing_inputs_lower_confidence(self, rice_baseline):
         """Missing inputs should lower confidence."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         assert result.confidence < 1.0
 
     def test_inputs_tracked(self):
@@ -227,9 +231,9 @@ class TestConfidenceCalculation:
 class TestCalculationDetails:
     """Test calculation transparency."""
 
-    def test_calculation_method_documented(self):
+    def test_calculation_method_documented(self, rice_baseline):
         """Calculation method should be documented."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         assert result.calculation_method != ""
         assert len(result.calculation_method) > 0
 
@@ -248,22 +252,22 @@ class TestCalculationDetails:
 class TestThaiLocalization:
     """Test Thai language output."""
 
-    def test_summary_is_thai(self):
+    def test_summary_is_thai(self, rice_baseline):
         """Summary should be in Thai."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         assert "แผนปุ๋ย" in result.summary_th
         assert "กก./ไร่" in result.summary_th
 
-    def test_fertilizer_names_have_thai(self):
+    def test_fertilizer_names_have_thai(self, rice_baseline):
         """Fertilizer options should have Thai names."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         for opt in result.fertilizer_options:
             assert opt.name_th is not None
             assert len(opt.name_th) > 0
 
-    def test_timing_has_thai(self):
+    def test_timing_has_thai(self, rice_baseline):
         """Application timing should have Thai description."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         for opt in result.fertilizer_options:
             assert opt.application_timing_th is not None
 
@@ -271,14 +275,14 @@ class TestThaiLocalization:
 class TestDisclaimers:
     """Test disclaimer generation."""
 
-    def test_disclaimers_always_present(self):
+    def test_disclaimers_always_present(self, rice_baseline):
         """Disclaimers should always be included."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         assert len(result.disclaimers) > 0
 
-    def test_disclaimers_mention_expert(self):
+    def test_disclaimers_mention_expert(self, rice_baseline):
         """Disclaimers should mention consulting experts."""
-        result = fertilizer_plan(FertilizerInput(crop="rice"))
+        result = rice_baseline
         disclaimer_text = " ".join(result.disclaimers)
         assert "ผู้เชี่ยวชาญ" in disclaimer_text or "เบื้องต้น" in disclaimer_text
 
@@ -291,6 +295,11 @@ class TestEdgeCases:
         with pytest.raises(ValueError):
             FertilizerInput(crop="rice", field_size_rai=0)
 
+    def test_input_is_immutable(self):
+        """Inputs are frozen so shared instances cannot leak between tests."""
+        with pytest.raises(ValueError):
+            OPTIMAL_FULL_FERT.crop = "cassava"
+
     def test_empty_crop_handled(self):
         """Empty crop should use default requirements."""
         result = fertilizer_plan(FertilizerInput(crop=""))
@@ -7,6 +7,35 @@ on Windows systems with various terminal encodings.
 
 import sys
 
+import pytest
+
+
+# Thai strings exercised by the logger/print tests. pytest escapes
+# non-ASCII parameters in test IDs, so node IDs stay ASCII-safe.
+THAI_TEXTS = (
+    "สวัสดีครับ",
+    "ระบบแนะนำการปรับปรุงดินอัจฉริยะ",
+    "ผู้เชี่ยวชาญชุดดิน",
+    "ข้าวไรซ์เบอร์รี่",
+    "อำเภอเด่นชัย จังหวัดแพร่",
+    "ไนโตรเจน ฟอสฟอรัส โพแทสเซียม",
+    "การวิเคราะห์ดิน",
+    "ผลผลิตเป้าหมาย 600 กก./ไร่",
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrapped():
+    """Run bootstrap_utf8() once before any test in this module."""
+    from core.encoding_bootstrap import bootstrap_utf8
+    bootstrap_utf8()
+
+
+@pytest.fixture(scope="module")
+def orchestrator():
+    """Orchestrator instance, imported and built after UTF-8 bootstrap."""
+    from core.orchestrator import SoilerOrchestrator
+    return SoilerOrchestrator(verbose=False)
 
 
 def test_bootstrap_import():
@@ -26,79 +55,49 @@ def test_bootstrap_idempotent():
     bootstrap_utf8()
 
 
-def test_utf8_logger_thai_text():
-    """Test that UTF-8 logger can handle Thai text without exception."""
-    from core.encoding_bootstrap import bootstrap_utf8, get_utf8_logger
+@pytest.fixture(scope="module")
+def utf8_logger():
+    """UTF-8 logger built once and shared by the parametrized cases."""
+    from core.encoding_bootstrap import get_utf8_logger
+    return get_utf8_logger("test_thai")
 
-    bootstrap_utf8()
-    logger = get_utf8_logger("test_thai")
-
-    # These should not raise UnicodeEncodeError
-    thai_texts = [
-        "สวัสดีครับ",
-        "ระบบแนะนำการปรับปรุงดินอัจฉริยะ",
-        "ผู้เชี่ยวชาญชุดดิน",
-        "ข้าวไรซ์เบอร์รี่",
-        "อำเภอเด่นชัย จังหวัดแพร่",
-        "ไนโตรเจน ฟอสฟอรัส โพแทสเซียม",
-    ]
-
-    for text in thai_texts:
-        # Should not raise
-        logger.info(text)
-        logger.warning(f"Warning: {text}")
-        logger.error(f"Error: {text}")
-
-
-def test_safe_print_thai_text():
-    """Test that safe_print handles Thai text without exception."""
-    from core.encoding_bootstrap import bootstrap_utf8, safe_print
 
-    bootstrap_utf8()
+@pytest.mark.parametrize("text", THAI_TEXTS)
+def test_utf8_logger_thai_text(utf8_logger, text):
+    """Test that UTF-8 logger can handle Thai text without exception."""
+    # Should not raise UnicodeEncodeError
+    utf8_logger.info(text)
+    utf8_logger.warning(f"Warning: {text}")
+    utf8_logger.error(f"Error: {text}")
+
 
-    # These should not raise UnicodeEncodeError
-    thai_texts = [
-        "สวัสดีครับ",
-        "การวิเคราะห์ดิน",
-        "ผลผลิตเป้าหมาย 600 กก./ไร่",
-    ]
+@pytest.mark.parametrize("text", THAI_TEXTS)
+def test_safe_print_thai_text(text):
+    """Test that safe_print handles Thai text without exception."""
+    from core.encoding_bootstrap import safe_print
 
-    for text in thai_texts:
-        # Should not raise
-        safe_print(text)
+    # Should not raise UnicodeEncodeError
+    safe_print(text)
 
 
+@pytest.mark.skipif(sys.platform != "win32", reason="Windows-only encoding check")
 def test_stdout_stderr_encoding():
     """Test that stdout/stderr have UTF-8 encoding after bootstrap."""
-    from core.encoding_bootstrap import bootstrap_utf8
-
-    bootstrap_utf8()
-
     # On Windows with reconfigure support, encoding should be UTF-8
-    if sys.platform == "win32" and hasattr(sys.stdout, "encoding"):
+    if hasattr(sys.stdout, "encoding"):
         # After bootstrap, should be utf-8 (or already was)
         assert sys.stdout.encoding.lower() in ("utf-8", "utf8", "cp65001")
 
 
-def test_orchestrator_import_no_crash():
+def test_orchestrator_import_no_crash(orchestrator):
     """Test that orchestrator can be imported without encoding crash."""
-    from core.encoding_bootstrap import bootstrap_utf8
-    bootstrap_utf8()
-
-    # This import should not crash with encoding errors
-    from core.orchestrator import SoilerOrchestrator
-
-    # Basic instantiation should work
-    orchestrator = SoilerOrchestrator(verbose=False)
+    # Import and basic instantiation happen in the fixture
     assert orchestrator is not None
 
 
 def test_environment_variables_set():
     """Test that bootstrap sets proper environment variables."""
     import os
-    from core.encoding_bootstrap import bootstrap_utf8
-
-    bootstrap_utf8()
 
     assert os.environ.get("PYTHONUTF8") == "1"
     assert os.environ.get("PYTHONIOENCODING") == "utf-8"
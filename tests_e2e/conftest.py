@@ -5,30 +5,65 @@ Starts Streamlit server with E2E mode enabled for deterministic testing.
 """
 
 import os
+import re
 import subprocess
 import sys
+import tempfile
 import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 import pytest
-import requests
 
 
-# E2E Test Port (different from default to avoid conflicts)
-E2E_PORT = 8502
+# E2E Test Port (different from default to avoid conflicts).
+# Each pytest-xdist worker (gw0, gw1, ...) runs its own server on its own port.
+E2E_PORT = 8502 + int(os.environ.get("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw"))
 E2E_BASE_URL = f"http://127.0.0.1:{E2E_PORT}"
 
+# SOILER_E2E=0 skips collecting the E2E tests (and importing Playwright),
+# e.g. for a unit-only run of "pytest tests/ tests_e2e/".
+collect_ignore_glob = ["test_*.py"] if os.environ.get("SOILER_E2E") == "0" else []
+
+# Requests to anything other than the local app server. Only these are
+# routed through Python, so the app's own bundle loads are not slowed.
+THIRD_PARTY_URL = re.compile(r"^https?://(?!127\.0\.0\.1[:/]|localhost[:/])")
+BLOCKED_RESOURCE_TYPES = ("font", "image", "media")
+
+# Element waits and assertions default to 5 s so a broken selector fails
+# fast; navigation and the app's first render get 30 s to cover the first
+# Streamlit script run. Tune here, not per call.
+DEFAULT_TIMEOUT_MS = 5000
+NAVIGATION_TIMEOUT_MS = 30000
+APP_READY_TIMEOUT_MS = 30000
+
 
 def wait_for_streamlit(url: str, timeout: int = 30) -> bool:
-    """Wait for Streamlit server to be responsive."""
+    """Wait for Streamlit server to be responsive.
+
+    Polls with exponential backoff (50 ms, growing 1.5x per attempt up
+    to 500 ms) so a fast start is detected within a poll or two. Probes
+    with HEAD so no body is transferred, switching to GET for the rest of
+    the loop if the health endpoint answers 405.
+    """
     start = time.time()
+    delay = 0.05
+    method = "HEAD"
     while time.time() - start < timeout:
+        request = Request(f"{url}/_stcore/health", method=method)
         try:
-            response = requests.get(f"{url}/_stcore/health", timeout=5)
-            if response.status_code == 200:
-                return True
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            with urlopen(request, timeout=1.0) as response:
+                if response.status == 200:
+                    return True
+        except HTTPError as e:
+            e.close()  # the error carries an open response
+            if e.code == 405 and method == "HEAD":
+                method = "GET"
+                continue
+        except OSError:  # URLError, connection refused, socket timeout
             pass
-        time.sleep(1)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.5)
     return False
 
 
@@ -41,14 +76,19 @@ def streamlit_server():
         - SOILER_E2E=1: Enable deterministic E2E mode
         - PYTHONUTF8=1: Force UTF-8 encoding
         - PYTHONIOENCODING=utf-8: Force UTF-8 encoding for streams
+
+    Set SOILER_E2E_VERBOSE=1 to stream server output to the console
+    instead of capturing it in a temp log.
     """
+    cwd = os.getcwd()
+
     # E2E environment variables
     env = {
         **os.environ,
         "SOILER_E2E": "1",
         "PYTHONUTF8": "1",
         "PYTHONIOENCODING": "utf-8",
-        "PYTHONPATH": os.getcwd(),
+        "PYTHONPATH": cwd,
     }
 
     # Command to run Streamlit
@@ -64,26 +104,45 @@ def streamlit_server():
         "true",
     ]
 
+    # Send server output to a temp file rather than pipes: nothing reads
+    # the pipes while tests run, and once the OS buffer fills Streamlit
+    # blocks on write and stalls mid-test.
+    log = None
+    if os.environ.get("SOILER_E2E_VERBOSE") != "1":
+        log = tempfile.NamedTemporaryFile(
+            prefix="soiler_e2e_streamlit_", suffix=".log", delete=False
+        )
+
     # Start process
     process = subprocess.Popen(
         cmd,
         env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        cwd=os.getcwd(),
+        stdout=log,
+        stderr=subprocess.STDOUT if log else None,
+        cwd=cwd,
     )
 
-    # Wait for server to be ready
-    if not wait_for_streamlit(E2E_BASE_URL):
-        process.terminate()
-        stdout, stderr = process.communicate(timeout=5)
-        print(f"Streamlit stdout: {stdout.decode('utf-8', errors='replace')}")
-        print(f"Streamlit stderr: {stderr.decode('utf-8', errors='replace')}")
-        pytest.fail("Streamlit failed to start within timeout")
-
-    yield E2E_BASE_URL
-
-    # Cleanup
+    try:
+        # Wait for server to be ready
+        if not wait_for_streamlit(E2E_BASE_URL):
+            _stop(process)
+            if log:
+                log.flush()
+                with open(log.name, encoding="utf-8", errors="replace") as f:
+                    print(f"Streamlit output:\n{f.read()}")
+            pytest.fail("Streamlit failed to start within timeout")
+
+        yield E2E_BASE_URL
+    finally:
+        # Cleanup
+        _stop(process)
+        if log:
+            log.close()
+            os.unlink(log.name)
+
+
+def _stop(process: subprocess.Popen) -> None:
+    """Terminate the Streamlit process, killing it if it does not exit."""
     process.terminate()
     try:
         process.wait(timeout=10)
@@ -92,28 +151,79 @@ def streamlit_server():
         process.wait()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _expect_timeout():
+    """Apply DEFAULT_TIMEOUT_MS to every expect() assertion."""
+    from playwright.sync_api import expect
+    expect.set_options(timeout=DEFAULT_TIMEOUT_MS)
+
+
+def _block_third_party_assets(route):
+    """Abort external font/image/media requests; let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _open_app(context, url: str):
+    """Open the app in a new page of context and wait for it to render."""
+    from playwright.sync_api import expect
+
+    page = context.new_page()
+    page.goto(url)
+
+    # Streamlit keeps its websocket and health polling open, so
+    # "networkidle" rarely settles. The app is ready once the main layout
+    # has rendered its summary anchor.
+    expect(page.locator("#selection-summary")).to_be_attached(timeout=APP_READY_TIMEOUT_MS)
+
+    return page
+
+
+@pytest.fixture(scope="session")
+def app_context(browser, streamlit_server):
+    """Browser context shared by every page in the session (per xdist worker).
+
+    Streamlit keeps session state per websocket connection, i.e. per page,
+    so pages opened in one context are still isolated from each other.
+    The app sets no cookies or storage the tests depend on, so nothing
+    needs clearing between tests.
+    """
+    context = browser.new_context(service_workers="block")
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+    # External fonts/images (Google Fonts, icon CDNs) are not needed by any
+    # assertion and are the slowest requests on a page load.
+    context.route(THIRD_PARTY_URL, _block_third_party_assets)
+    yield context
+    context.close()
+
+
 @pytest.fixture(scope="function")
-def page(browser, streamlit_server):
+def page(app_context, streamlit_server):
     """Create a new page for each test and navigate to the app."""
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto(streamlit_server)
+    page = _open_app(app_context, streamlit_server)
+    yield page
+    page.close()
 
-    # Wait for Streamlit app to fully load (not just network idle)
-    # The app is ready when the main title appears
-    page.wait_for_load_state("networkidle")
 
-    # Wait for Streamlit to finish loading (title changes from "Streamlit")
-    try:
-        page.wait_for_function(
-            "document.title !== 'Streamlit'",
-            timeout=30000
-        )
-    except Exception:
-        pass  # Continue even if title doesn't change
+@pytest.fixture(scope="class")
+def class_page(app_context, streamlit_server):
+    """Load the app once per test class for tests that share one page state."""
+    page = _open_app(app_context, streamlit_server)
+    yield page
+    page.close()
+
 
-    # Extra wait for JavaScript to initialize
-    page.wait_for_timeout(2000)
+@pytest.fixture(scope="module")
+def loaded_page(app_context, streamlit_server):
+    """Load the app once per module for tests that only read the initial state.
 
+    Each navigation re-runs streamlit_app.py server-side, so read-only
+    checks share this page instead of paying for their own load. Tests
+    that click or change inputs must use ``page``.
+    """
+    page = _open_app(app_context, streamlit_server)
     yield page
-    context.close()
+    page.close()
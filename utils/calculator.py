@@ -3,10 +3,71 @@ S.O.I.L.E.R. Fertilizer Calculator
 Utility functions for calculating fertilizer requirements and costs.
 """
 
+import math
+from bisect import bisect_right
 from typing import Any, Dict, List, Tuple
 
 from data.knowledge_base import CROP_REQUIREMENTS, FERTILIZERS
 
+# Fertilizer lookup by formula (e.g. "46-0-0"), built once at import
+_FERT_BY_FORMULA = {f["formula"]: f for f in FERTILIZERS}
+
+# Per nutrient: soil key, crop requirement key, and the soil level (mg/kg)
+# at which no fertilizer is needed
+_GAP_NUTRIENTS = (
+    ("nitrogen", "nitrogen", 80),
+    ("phosphorus", "phosphorus_p2o5", 50),
+    ("potassium", "potassium_k2o", 200),
+)
+
+# Optimal N, P2O5, K2O (kg/rai) per crop, in _GAP_NUTRIENTS order
+_CROP_OPT = {
+    name: tuple(
+        crop["nutrient_requirements_kg_per_rai"][req_key]["optimal"]
+        for _, req_key, _ in _GAP_NUTRIENTS
+    )
+    for name, crop in CROP_REQUIREMENTS.items()
+}
+
+# Lime buffer capacity by soil texture (higher clay = more lime needed)
+_TEXTURE_FACTORS = {
+    "sand": 0.8,
+    "loamy sand": 1.0,
+    "sandy loam": 1.2,
+    "loam": 1.5,
+    "silt loam": 1.6,
+    "clay loam": 2.0,
+    "silty clay loam": 2.2,
+    "silty clay": 2.5,
+    "clay": 3.0,
+}
+
+# Nutrient status bands for assess_nutrient_level, lowest first
+_LEVELS = (
+    ("very_low", "Critical deficiency - immediate attention needed"),
+    ("low", "Deficient - supplementation recommended"),
+    ("medium", "Adequate - maintenance fertilization"),
+    ("high", "Sufficient - reduce fertilizer application"),
+    ("very_high", "Excess - no fertilizer needed, monitor for toxicity"),
+)
+# Bands with an upper bound in the threshold tables (all but the last)
+_LEVEL_NAMES = tuple(name for name, _ in _LEVELS[:-1])
+
+# Upper bound (mg/kg, exclusive) of each band in _LEVEL_NAMES
+_DEFAULT_THRESHOLDS = {
+    "nitrogen": {"very_low": 15, "low": 30, "medium": 60, "high": 80},
+    "phosphorus": {"very_low": 8, "low": 15, "medium": 30, "high": 50},
+    "potassium": {"very_low": 40, "low": 80, "medium": 150, "high": 200},
+}
+_FALLBACK_THRESHOLDS = {"very_low": 10, "low": 25, "medium": 50, "high": 75}
+
+# Thresholds flattened into sorted cutoffs for a single bisect per lookup
+_NUTRIENT_CUTOFFS = {
+    nutrient: tuple(thresh[name] for name in _LEVEL_NAMES)
+    for nutrient, thresh in _DEFAULT_THRESHOLDS.items()
+}
+_FALLBACK_CUTOFFS = tuple(_FALLBACK_THRESHOLDS[name] for name in _LEVEL_NAMES)
+
 
 def calculate_nutrient_gap(
     current_npk: Dict[str, float],
@@ -26,30 +87,24 @@ def calculate_nutrient_gap(
         Dictionary with nutrient gaps in kg needed per rai:
             {"nitrogen_gap_kg": float, "p2o5_gap_kg": float, "k2o_gap_kg": float}
     """
-    crop = CROP_REQUIREMENTS.get(crop_name)
-    if not crop:
+    optimal = _CROP_OPT.get(crop_name)
+    if optimal is None:
         raise ValueError(f"Unknown crop: {crop_name}")
 
-    requirements = crop["nutrient_requirements_kg_per_rai"]
-
     # Convert soil levels (mg/kg) to relative fertility status
     # Using simplified conversion: mg/kg thresholds from knowledge base
     # Low < 30, Medium 30-60, High > 60 for N (approximate)
 
-    n_current = current_npk.get("nitrogen", 0)
-    p_current = current_npk.get("phosphorus", 0)
-    k_current = current_npk.get("potassium", 0)
-
     # Calculate soil contribution factor (0.0 to 1.0) based on current levels
-    # Higher soil levels = less fertilizer needed
-    n_factor = min(1.0, max(0.0, 1.0 - (n_current / 80)))  # Reduce if N > 80 mg/kg
-    p_factor = min(1.0, max(0.0, 1.0 - (p_current / 50)))  # Reduce if P > 50 mg/kg
-    k_factor = min(1.0, max(0.0, 1.0 - (k_current / 200))) # Reduce if K > 200 mg/kg
+    # Higher soil levels = less fertilizer needed; none above saturation
+    factors = [
+        min(1.0, max(0.0, 1.0 - (current_npk.get(soil_key, 0) / saturation)))
+        for soil_key, _, saturation in _GAP_NUTRIENTS
+    ]
+    n_factor, p_factor, k_factor = factors
 
     # Calculate gaps (what we need to add)
-    n_gap = requirements["nitrogen"]["optimal"] * n_factor
-    p_gap = requirements["phosphorus_p2o5"]["optimal"] * p_factor
-    k_gap = requirements["potassium_k2o"]["optimal"] * k_factor
+    n_gap, p_gap, k_gap = (opt * factor for opt, factor in zip(optimal, factors))
 
     return {
         "nitrogen_gap_kg": round(n_gap * field_size_rai, 2),
@@ -86,7 +141,7 @@ def calculate_fertilizer_amounts(
     # Strategy: Use compound fertilizer first, then single-nutrient to top up
 
     # Check if NPK 16-20-0 can cover base needs (good for rice)
-    npk_16_20_0 = next((f for f in FERTILIZERS if f["formula"] == "16-20-0"), None)
+    npk_16_20_0 = _FERT_BY_FORMULA.get("16-20-0")
 
     if npk_16_20_0 and p_needed > 0:
         # Calculate how much 16-20-0 to apply based on P requirement
@@ -118,7 +173,7 @@ def calculate_fertilizer_amounts(
 
     # Top up Nitrogen with Urea (46-0-0)
     if n_needed > 0:
-        urea = next((f for f in FERTILIZERS if f["formula"] == "46-0-0"), None)
+        urea = _FERT_BY_FORMULA.get("46-0-0")
         if urea:
             n_content = urea["npk_ratio"]["N"] / 100
             amount_urea = n_needed / n_content
@@ -138,7 +193,7 @@ def calculate_fertilizer_amounts(
 
     # Add Potassium with MOP (0-0-60)
     if k_needed > 0:
-        mop = next((f for f in FERTILIZERS if f["formula"] == "0-0-60"), None)
+        mop = _FERT_BY_FORMULA.get("0-0-60")
         if mop:
             k_content = mop["npk_ratio"]["K"] / 100
             amount_mop = k_needed / k_content
@@ -171,28 +226,26 @@ def calculate_total_cost(
     Returns:
         Cost breakdown dictionary
     """
-    cost_breakdown = []
-    total_cost = 0.0
+    items = [
+        (rec["fertilizer"], rec["amount_kg"]) for rec in fertilizer_recommendations
+    ]
+    costs = [amount * fert["price_thb_per_kg"] for fert, amount in items]
 
-    for rec in fertilizer_recommendations:
-        fert = rec["fertilizer"]
-        amount = rec["amount_kg"]
-        unit_price = fert["price_thb_per_kg"]
-        item_cost = amount * unit_price
-
-        cost_breakdown.append({
+    cost_breakdown = [
+        {
             "fertilizer_name": fert["name"],
             "formula": fert["formula"],
             "quantity_kg": amount,
-            "unit_price_thb": unit_price,
+            "unit_price_thb": fert["price_thb_per_kg"],
             "total_cost_thb": round(item_cost, 2)
-        })
-
-        total_cost += item_cost
+        }
+        for (fert, amount), item_cost in zip(items, costs)
+    ]
 
     return {
         "breakdown": cost_breakdown,
-        "total_cost_thb": round(total_cost, 2),
+        # fsum: exact total of the unrounded item costs
+        "total_cost_thb": round(math.fsum(costs), 2),
         "currency": "THB"
     }
 
@@ -225,20 +278,8 @@ def calculate_lime_requirement(
 
     ph_difference = target_ph - current_ph
 
-    # Buffer capacity based on texture (higher clay = more lime needed)
-    texture_factors = {
-        "sand": 0.8,
-        "loamy sand": 1.0,
-        "sandy loam": 1.2,
-        "loam": 1.5,
-        "silt loam": 1.6,
-        "clay loam": 2.0,
-        "silty clay loam": 2.2,
-        "silty clay": 2.5,
-        "clay": 3.0,
-    }
-
-    factor = texture_factors.get(soil_texture.lower(), 1.5)
+    # Buffer capacity based on texture; unknown textures count as loam
+    factor = _TEXTURE_FACTORS.get(soil_texture.lower(), 1.5)
 
     # Base rate: ~200 kg/rai agricultural lime per 0.5 pH unit for medium texture
     base_rate = 200  # kg per rai per 0.5 pH unit
@@ -272,23 +313,15 @@ def assess_nutrient_level(
     Returns:
         Tuple of (status, description)
     """
-    default_thresholds = {
-        "nitrogen": {"very_low": 15, "low": 30, "medium": 60, "high": 80},
-        "phosphorus": {"very_low": 8, "low": 15, "medium": 30, "high": 50},
-        "potassium": {"very_low": 40, "low": 80, "medium": 150, "high": 200},
-    }
-
-    thresh = thresholds or default_thresholds.get(nutrient.lower(), {
-        "very_low": 10, "low": 25, "medium": 50, "high": 75
-    })
-
-    if value < thresh["very_low"]:
-        return "very_low", "Critical deficiency - immediate attention needed"
-    elif value < thresh["low"]:
-        return "low", "Deficient - supplementation recommended"
-    elif value < thresh["medium"]:
-        return "medium", "Adequate - maintenance fertilization"
-    elif value < thresh["high"]:
-        return "high", "Sufficient - reduce fertilizer application"
+    if thresholds:
+        # Custom thresholds may not be sorted: take the first band whose
+        # bound the value is below, as a plain if/elif ladder would
+        cutoffs = [thresholds[name] for name in _LEVEL_NAMES]
+        band = next(
+            (i for i, bound in enumerate(cutoffs) if value < bound), len(cutoffs)
+        )
     else:
-        return "very_high", "Excess - no fertilizer needed, monitor for toxicity"
+        cutoffs = _NUTRIENT_CUTOFFS.get(nutrient.lower(), _FALLBACK_CUTOFFS)
+        band = bisect_right(cutoffs, value)
+
+    return _LEVELS[band]
@@ -1,16 +1,36 @@
 import logging
+import os
 import sys
-import datetime
+import time
+from collections import deque
 
 import streamlit as st
 
 from core.encoding_bootstrap import bootstrap_utf8
 
+# Set SOILER_DEBUG_LOGS=1 to also keep recent log lines in session state
+_CAPTURE_UI = os.getenv("SOILER_DEBUG_LOGS") == "1"
+_MAX_UI_LOGS = 500
+
+_logger = logging.getLogger(__name__)
+
+_LEVEL_MAP = {
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+}
+
 
 class UILogger:
+    # Set once setup() has run; module state survives Streamlit reruns
+    _ready = False
+
     @staticmethod
     def setup():
-        """Configure logging to console with UTF-8 encoding."""
+        """Configure logging to console with UTF-8 encoding (once per process)."""
+        if UILogger._ready:
+            return
+
         # Ensure UTF-8 encoding is bootstrapped first
         bootstrap_utf8()
 
@@ -35,24 +55,21 @@ class UILogger:
         root_logger.handlers.clear()
         root_logger.addHandler(handler)
 
+        # Only mark ready once configured, so a failed first call is retried
+        UILogger._ready = True
+
     @staticmethod
     def log(message: str, level: str = "info"):
         """Log to console and optionally to Streamlit session state for debugging."""
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_msg = f"[{timestamp}] {message}"
-        
-        # Console log
-        if level.lower() == "error":
-            logging.error(message)
-        elif level.lower() == "warning":
-            logging.warning(message)
-        else:
-            logging.info(message)
-            
-        # UI Log (store in session state if needed for debug expander)
-        if "debug_logs" not in st.session_state:
-            st.session_state["debug_logs"] = []
-        st.session_state["debug_logs"].append(log_msg)
+        # Console log (formatted by the handler only if the level is enabled)
+        _logger.log(_LEVEL_MAP.get(level.lower(), logging.INFO), "%s", message)
+
+        # UI Log (opt-in; bounded so long sessions don't grow session state)
+        if _CAPTURE_UI:
+            if "debug_logs" not in st.session_state:
+                st.session_state["debug_logs"] = deque(maxlen=_MAX_UI_LOGS)
+            timestamp = time.strftime("%H:%M:%S")
+            st.session_state["debug_logs"].append(f"[{timestamp}] {message}")
 
     @staticmethod
     def get_logs():